@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import hashlib
 import hmac
 import json
@@ -455,8 +456,16 @@ def _digits_to_text(digits: str) -> str:
     return data.decode("utf-8")
 
 
+@functools.lru_cache(maxsize=16)
+def _hmac_prototype(key: bytes) -> "hmac.HMAC":
+    # Подготовка ключа (ipad/opad) выполняется один раз; подписи копируют готовое состояние.
+    return hmac.new(key, digestmod=hashlib.sha256)
+
+
 def _compute_signature(body: str, key: bytes) -> str:
-    digest = hmac.new(key, body.encode("ascii"), hashlib.sha256).digest()
+    signer = _hmac_prototype(key).copy()
+    signer.update(body.encode("ascii"))
+    digest = signer.digest()
     return "".join(str(byte % 10) for byte in digest)
 
 
@@ -1,9 +1,16 @@
 """LL(1)-парсер KolibriScript с диагностикой."""
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
 from typing import Iterable, Iterator, List, Optional, Sequence
 
+# Серии пробелов, тела строк и идентификаторы сканируются движком re за один вызов.
+# ``\w`` в Unicode-режиме совпадает ровно с ``str.isalnum() or "_"``.
+_RE_SPACES = re.compile(r"[ \t\r]+")
+_RE_STRING_BODY = re.compile(r'[^"\n]*')
+_RE_IDENTIFIER = re.compile(r"\w+")
+
 
 @dataclass(frozen=True)
 class SourceLocation:
@@ -169,7 +176,10 @@ class Lexer:
         while self.index < self.length:
             ch = self.source[self.index]
             if ch in " \t\r":
-                self._advance(ch)
+                match = _RE_SPACES.match(self.source, self.index)
+                assert match is not None
+                self.column += match.end() - self.index
+                self.index = match.end()
                 continue
             if ch == "\n":
                 yield self._make_token("NEWLINE", "\n", length=1)
@@ -201,14 +211,6 @@ class Lexer:
             raise ValueError(f"Unexpected character {ch!r} at {self.line}:{self.column}")
         yield Token("EOF", "", SourceSpan(self._location(), self._location()))
 
-    def _advance(self, ch: str) -> None:
-        self.index += 1
-        if ch == "\n":
-            self.line += 1
-            self.column = 1
-        else:
-            self.column += 1
-
     def _location(self, *, back: int = 0) -> SourceLocation:
         return SourceLocation(self.line, self.column - back)
 
@@ -224,24 +226,16 @@ class Lexer:
 
     def _read_string(self) -> Token:
         start_location = SourceLocation(self.line, self.column)
-        self.index += 1
+        body = _RE_STRING_BODY.match(self.source, self.index + 1)
+        assert body is not None
+        if body.end() >= self.length or self.source[body.end()] == "\n":
+            raise ValueError("Unterminated string literal")
+        value = body.group()
+        self.column += len(value) + 1
+        end_location = SourceLocation(self.line, self.column)
+        self.index = body.end() + 1
         self.column += 1
-        value_chars: List[str] = []
-        while self.index < self.length:
-            ch = self.source[self.index]
-            if ch == '"':
-                end_location = SourceLocation(self.line, self.column)
-                self.index += 1
-                self.column += 1
-                span = SourceSpan(start_location, SourceLocation(end_location.line, end_location.column))
-                literal = '"' + "".join(value_chars) + '"'
-                return Token("STRING", literal, span)
-            if ch == "\n":
-                raise ValueError("Unterminated string literal")
-            value_chars.append(ch)
-            self.index += 1
-            self.column += 1
-        raise ValueError("Unterminated string literal")
+        return Token("STRING", '"' + value + '"', SourceSpan(start_location, end_location))
 
     def _read_number(self) -> Token:
         start_location = SourceLocation(self.line, self.column)
@@ -254,12 +248,12 @@ class Lexer:
         return Token("NUMBER", "".join(value_chars), SourceSpan(start_location, end_location))
 
     def _read_identifier(self) -> Token:
-        start_index = self.index
+        match = _RE_IDENTIFIER.match(self.source, self.index)
+        assert match is not None
+        value = match.group()
         start_column = self.column
-        while self.index < self.length and (self.source[self.index].isalnum() or self.source[self.index] == "_"):
-            self.index += 1
-            self.column += 1
-        value = self.source[start_index:self.index]
+        self.index = match.end()
+        self.column += len(value)
         type_ = "KEYWORD" if value in self.KEYWORDS else "IDENT"
         start = SourceLocation(self.line, start_column)
         end = SourceLocation(self.line, self.column - 1)
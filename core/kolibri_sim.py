@@ -11,6 +11,7 @@ import json
 import os
 import random
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Protocol, Sequence, TypedDict, cast
 
@@ -134,11 +135,19 @@ def dolzhen_zapustit_repl(peremennye: Mapping[str, str], est_tty: bool) -> bool:
     return peremennye.get("KOLIBRI_REPL") == "1" and est_tty
 
 
+@lru_cache(maxsize=16)
+def _hmac_prototip(klyuch: bytes) -> "hmac.HMAC":
+    """Возвращает HMAC с подготовленным ключом, который копируется для каждой подписи."""
+
+    return hmac.new(klyuch, digestmod=hashlib.sha256)
+
+
 def _poschitat_hmac(klyuch: bytes, pred_hash: str, payload: str) -> str:
     """Возвращает HMAC-SHA256 в десятичном представлении."""
 
-    soobshenie = (pred_hash + payload).encode("utf-8")
-    hex_kod = hmac.new(klyuch, soobshenie, hashlib.sha256).hexdigest()
+    podpis = _hmac_prototip(klyuch).copy()
+    podpis.update((pred_hash + payload).encode("utf-8"))
+    hex_kod = podpis.hexdigest()
     return preobrazovat_tekst_v_cifry(hex_kod)
 
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import json
+from collections import defaultdict
 from collections.abc import Mapping as ABCMapping, Sequence as ABCSequence
 from dataclasses import dataclass
 from pathlib import Path
@@ -11,6 +12,7 @@ from statistics import mean
 from typing import Iterable, Mapping
 
 from apps.flagship.metrics import ExperienceReview
+from scripts.json_output import render_json
 
 
 @dataclass(frozen=True, slots=True)
@@ -63,9 +65,9 @@ def load_feedback(payload: Iterable[Mapping[str, object]]) -> list[FeedbackEntry
 
 
 def summarize_feedback(entries: Iterable[FeedbackEntry]) -> list[BetaSummary]:
-    grouped: dict[str, list[FeedbackEntry]] = {}
+    grouped: defaultdict[str, list[FeedbackEntry]] = defaultdict(list)
     for entry in entries:
-        grouped.setdefault(entry.app, []).append(entry)
+        grouped[entry.app].append(entry)
 
     summaries: list[BetaSummary] = []
     for app, app_entries in grouped.items():
@@ -100,25 +102,23 @@ def main(argv: list[str] | None = None) -> int:
         raise ValueError("Ожидался JSON-массив отзывов")
     entries = load_feedback(payload)
     summaries = summarize_feedback(entries)
-    rendered = json.dumps(
+    rendered = render_json(
         [
             {
                 "app": summary.review.app,
-                "satisfaction": round(summary.review.satisfaction, 3),
-                "retention": round(summary.review.retention, 3),
-                "nps": round(summary.review.nps, 1),
+                "satisfaction": summary.review.satisfaction,
+                "retention": summary.review.retention,
+                "nps": summary.review.nps,
                 "meets_targets": summary.review.meets_targets(),
                 "top_pains": list(summary.top_pains),
             }
             for summary in summaries
-        ],
-        ensure_ascii=False,
-        indent=2,
+        ]
     )
     if args.output:
-        args.output.write_text(rendered, encoding="utf-8")
+        args.output.write_bytes(rendered)
     else:  # pragma: no cover - ручной запуск
-        print(rendered)
+        print(rendered.decode("utf-8"))
     return 0
 
 
@@ -8,13 +8,20 @@ from __future__ import annotations
 
 import argparse
 import hashlib
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 
+try:
+    from scripts.json_output import render_json
+except ImportError:  # запуск как ``python scripts/generate_sbom.py``
+    from json_output import render_json  # type: ignore[no-redef]
+
 DEFAULT_OUTPUT = "build/wasm/kolibri.wasm.sbom.json"
 DEFAULT_MODULE = "build/wasm/kolibri.wasm"
+SOURCE_PATH = Path("wasm/kolibri_core.c")
+EMPTY_DIGEST = "0" * 64
 EXPORTS: List[str] = [
     "_k_state_new",
     "_k_state_free",
@@ -40,10 +47,18 @@ def sha256(path: Path) -> str:
     return hasher.hexdigest()
 
 
+def _digest_or_empty(path: Path) -> str:
+    return sha256(path) if path.exists() else EMPTY_DIGEST
+
+
 def collect_metadata(module: Path) -> Dict[str, object]:
     size = module.stat().st_size if module.exists() else 0
-    checksum = sha256(module) if module.exists() else "0" * 64
-    source_hash = sha256(Path("wasm/kolibri_core.c")) if Path("wasm/kolibri_core.c").exists() else "0" * 64
+    # Модуль и исходник хэшируются параллельно: hashlib отпускает GIL на больших блоках.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        checksum_future = pool.submit(_digest_or_empty, module)
+        source_future = pool.submit(_digest_or_empty, SOURCE_PATH)
+        checksum = checksum_future.result()
+        source_hash = source_future.result()
     return {
         "module": str(module),
         "size_bytes": size,
@@ -65,6 +80,10 @@ def collect_metadata(module: Path) -> Dict[str, object]:
     }
 
 
+def render_metadata(metadata: Dict[str, object]) -> bytes:
+    return render_json(metadata, trailing_newline=True)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Generate SBOM for kolibri.wasm")
     parser.add_argument("module", nargs="?", default=DEFAULT_MODULE, help="Путь до wasm-модуля")
@@ -75,9 +94,7 @@ def main() -> int:
     metadata = collect_metadata(module_path)
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as handle:
-        json.dump(metadata, handle, ensure_ascii=False, indent=2)
-        handle.write("\n")
+    output_path.write_bytes(render_metadata(metadata))
     print(f"[sbom] saved {output_path} (module: {module_path})")
     return 0
 
@@ -6,6 +6,7 @@ from __future__ import annotations
 import argparse
 import subprocess
 import tempfile
+import threading
 from pathlib import Path
 
 
@@ -13,6 +14,15 @@ def project_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+def _print_hit(line: str) -> None:
+    parts = line.split("\t", 2)
+    if len(parts) == 3:
+        score, doc_id, title = parts
+        print(f"[{float(score):.4f}] {title} ({doc_id})")
+    else:
+        print(line)
+
+
 def run() -> None:
     parser = argparse.ArgumentParser(description="Kolibri knowledge ingestion helper")
     parser.add_argument("query", nargs="?", default="", help="Search query to execute")
@@ -43,7 +53,9 @@ def run() -> None:
     if not query:
         return
 
-    completed = subprocess.run(
+    stderr_chunks: list[str] = []
+    found = False
+    with subprocess.Popen(
         [
             str(indexer_path),
             "search",
@@ -53,25 +65,31 @@ def run() -> None:
             str(args.limit),
             *roots,
         ],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
-    )
-    if completed.returncode != 0:
-        print(completed.stderr.strip() or "Поиск не выполнен")
-        return
+        bufsize=1,
+    ) as process:
+        assert process.stdout is not None and process.stderr is not None
+        stderr = process.stderr
+        # stderr вычитывается отдельно, чтобы заполненный канал не заблокировал индексатор.
+        drainer = threading.Thread(target=lambda: stderr_chunks.append(stderr.read()), daemon=True)
+        drainer.start()
+        for raw_line in process.stdout:
+            line = raw_line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            found = True
+            _print_hit(line)
+        returncode = process.wait()
+        drainer.join()
 
-    lines = [line for line in completed.stdout.splitlines() if line.strip()]
-    if not lines:
-        print("Знания не найдены.")
+    if returncode != 0:
+        print("".join(stderr_chunks).strip() or "Поиск не выполнен")
         return
 
-    for line in lines:
-        parts = line.split("\t", 2)
-        if len(parts) == 3:
-            score, doc_id, title = parts
-            print(f"[{float(score):.4f}] {title} ({doc_id})")
-        else:
-            print(line)
+    if not found:
+        print("Знания не найдены.")
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI entry point
@@ -0,0 +1,27 @@
+"""Общая сериализация JSON-отчётов скриптов Kolibri в bytes.
+
+Если установлен необязательный ``orjson``, он сериализует в C и сразу отдаёт
+bytes; иначе используется stdlib ``json``. Оба пути дают JSON с отступом
+в два пробела и без экранирования не-ASCII символов.
+"""
+
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависимость необязательна
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ["render_json"]
+
+
+def render_json(payload: object, *, trailing_newline: bool = False) -> bytes:
+    """Сериализует ``payload`` в UTF-8 JSON с отступом в два пробела."""
+
+    if orjson is not None:
+        dannye = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    else:
+        dannye = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    return dannye + b"\n" if trailing_newline else dannye
@@ -11,10 +11,9 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping
 
 from training import (
-    MentorshipProgram,
     build_learning_journey,
     load_program_from_mapping,
 )
@@ -50,16 +49,22 @@ def load_json(path: Path) -> dict[str, Any]:
     return data
 
 
-def main(argv: list[str] | None = None) -> int:
-    args = parse_args(argv)
-    config = load_json(args.config)
+def generate_schedule(
+    config: Mapping[str, Any],
+    *,
+    weeks: int,
+    target_score: float,
+    include_summary: bool = False,
+) -> dict[str, Any]:
+    """Построить расписание программы из конфигурации без обращения к диску."""
+
     program = load_program_from_mapping(config)
     program.sessions_per_week = int(config.get("sessions_per_week", program.sessions_per_week))
 
     result = build_learning_journey(
         program,
-        weeks=args.weeks,
-        target_score=args.target_score,
+        weeks=weeks,
+        target_score=target_score,
     )
     payload: dict[str, Any]
     payload = {
@@ -75,8 +80,20 @@ def main(argv: list[str] | None = None) -> int:
         ]
     }
 
-    if args.summary:
+    if include_summary:
         payload["summary"] = result.summary(program).to_dict()
+    return payload
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    config = load_json(args.config)
+    payload = generate_schedule(
+        config,
+        weeks=args.weeks,
+        target_score=args.target_score,
+        include_summary=args.summary,
+    )
 
     rendered = json.dumps(payload, ensure_ascii=False, indent=2)
     if args.output:
@@ -3,6 +3,7 @@
 """Проверка блока политики в AGENTS.md."""
 import re
 from pathlib import Path
+from typing import AbstractSet, Pattern
 
 RE_BLOCK = re.compile(r"```kolibri-policy\n(.*?)\n```", re.DOTALL | re.MULTILINE)
 REQUIRED_TOP = {"build", "code", "docs"}
@@ -15,6 +16,23 @@ REQUIRED_BUDGETS = {
 }
 
 
+def _alternativa(klyuchi: AbstractSet[str]) -> str:
+    return "|".join(re.escape(klyuch) for klyuch in sorted(klyuchi))
+
+
+# Шаблоны собираются один раз: каждая группа ключей проверяется одним проходом finditer.
+RE_TOP = re.compile(rf"^({_alternativa(REQUIRED_TOP)})\s*:\s*(?:ours|theirs)\s*$", re.MULTILINE)
+RE_FILES_SECTION = re.compile(r"files\s*:\s*\n")
+# Элемент списка ограничен одной строкой: совпадения finditer не пересекаются,
+# и «-» без текста не должен захватывать строку следующего ключа.
+RE_FILES_KEYS = re.compile(
+    rf"^[\t ]*({_alternativa(REQUIRED_FILES_KEYS)})\s*:\s*\n(?:[\t ]*-[^\n]*\n)+",
+    re.MULTILINE,
+)
+RE_BUDGETS_SECTION = re.compile(r"budgets\s*:\s*\n")
+RE_BUDGETS = re.compile(rf"^[\t ]*({_alternativa(REQUIRED_BUDGETS)})\s*:\s*\d+\s*$", re.MULTILINE)
+
+
 def zagruzit_blok(path: Path) -> str:
     """Читает AGENTS.md и извлекает содержимое блока политики."""
     tekst = path.read_text(encoding="utf-8")
@@ -24,39 +42,37 @@ def zagruzit_blok(path: Path) -> str:
     return sovpadenie.group(1)
 
 
-def proverit_shablon(obrazec: str, tekst: str, soobshchenie: str) -> None:
+def proverit_shablon(obrazec: Pattern[str], tekst: str, soobshchenie: str) -> None:
     """Проверяет наличие шаблона в тексте и завершает процесс при отсутствии."""
-    if not re.search(obrazec, tekst, re.MULTILINE):
+    if not obrazec.search(tekst):
         raise SystemExit(soobshchenie)
 
 
+def proverit_klyuchi(obrazec: Pattern[str], tekst: str, klyuchi: AbstractSet[str], soobshchenie: str) -> None:
+    """Одним проходом собирает найденные ключи и завершает процесс при нехватке обязательных."""
+    najdennye = {sovpadenie.group(1) for sovpadenie in obrazec.finditer(tekst)}
+    nedostayushchie = sorted(klyuchi - najdennye)
+    if nedostayushchie:
+        raise SystemExit(soobshchenie.format(klyuch=nedostayushchie[0]))
+
+
 def main() -> None:
     """Запускает проверку всех обязательных ключей политики."""
     agent = Path("AGENTS.md")
     blok = zagruzit_blok(agent)
 
-    for klyuch in REQUIRED_TOP:
-        proverit_shablon(
-            rf"^{klyuch}\s*:\s*(ours|theirs)\s*$",
-            blok,
-            f"Ключ '{klyuch}' должен быть задан значением ours или theirs.",
-        )
-
-    proverit_shablon(r"files\s*:\s*\n", blok, "Отсутствует секция 'files:'.")
-    for klyuch in REQUIRED_FILES_KEYS:
-        proverit_shablon(
-            rf"^[\t ]*{klyuch}\s*:\s*\n(?:[\t ]*-\s*.*\n)+",
-            blok,
-            f"Секция files/{klyuch} должна содержать хотя бы один шаблон.",
-        )
-
-    proverit_shablon(r"budgets\s*:\s*\n", blok, "Отсутствует секция 'budgets:'.")
-    for klyuch in REQUIRED_BUDGETS:
-        proverit_shablon(
-            rf"^[\t ]*{klyuch}\s*:\s*\d+\s*$",
-            blok,
-            f"Бюджет {klyuch} должен быть задан целым числом.",
-        )
+    proverit_klyuchi(RE_TOP, blok, REQUIRED_TOP, "Ключ '{klyuch}' должен быть задан значением ours или theirs.")
+
+    proverit_shablon(RE_FILES_SECTION, blok, "Отсутствует секция 'files:'.")
+    proverit_klyuchi(
+        RE_FILES_KEYS,
+        blok,
+        REQUIRED_FILES_KEYS,
+        "Секция files/{klyuch} должна содержать хотя бы один шаблон.",
+    )
+
+    proverit_shablon(RE_BUDGETS_SECTION, blok, "Отсутствует секция 'budgets:'.")
+    proverit_klyuchi(RE_BUDGETS, blok, REQUIRED_BUDGETS, "Бюджет {klyuch} должен быть задан целым числом.")
 
     print("policy: OK")
 
@@ -5,15 +5,15 @@ from __future__ import annotations
 
 import argparse
 import importlib.util
-import json
 import logging
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from fnmatch import fnmatch
 from pathlib import Path
 from typing import (
     Callable,
     Dict,
-    Iterable,
     List,
     Literal,
     Optional,
@@ -24,9 +24,21 @@ from typing import (
 )
 from types import ModuleType
 
+try:
+    from scripts.json_output import render_json
+except ImportError:  # запуск как ``python scripts/resolve_conflicts.py``
+    from json_output import render_json  # type: ignore[no-redef]
+
 KONFLIKT_START = "<<<<<<<"
 KONFLIKT_DELIM = "======="
 KONFLIKT_END = ">>>>>>>"
+MAKS_POTOKOV = 32
+KONFLIKT_START_BYTES = KONFLIKT_START.encode("ascii")
+KONFLIKT_DELIM_BYTES = KONFLIKT_DELIM.encode("ascii")
+KONFLIKT_END_BYTES = KONFLIKT_END.encode("ascii")
+RE_MARKER = re.compile(
+    b"|".join(re.escape(m) for m in (KONFLIKT_START_BYTES, KONFLIKT_DELIM_BYTES, KONFLIKT_END_BYTES))
+)
 LOGGER = logging.getLogger("resolve_conflicts")
 SCRIPT_DIR = Path(__file__).resolve().parent
 _POLICY_MODULE: ModuleType | None = None
@@ -146,21 +158,6 @@ def vybrat_po_pravilam(
     return None
 
 
-def _najti_marker(stroka: str) -> Tuple[int, Optional[str]]:
-    """Ищет ближайший конфликтный маркер в строке."""
-
-    luchshij_indeks = len(stroka)
-    vybrannyj_marker: Optional[str] = None
-    for marker in (KONFLIKT_START, KONFLIKT_DELIM, KONFLIKT_END):
-        indeks = stroka.find(marker)
-        if indeks != -1 and indeks < luchshij_indeks:
-            luchshij_indeks = indeks
-            vybrannyj_marker = marker
-    if vybrannyj_marker is None:
-        return -1, None
-    return luchshij_indeks, vybrannyj_marker
-
-
 def _propustit_marker_stroki(stroka: str, marker: str) -> str:
     """Удаляет маркер и сопутствующую служебную информацию, возвращая остаток строки."""
 
@@ -180,76 +177,74 @@ def _propustit_marker_stroki(stroka: str, marker: str) -> str:
 
 
 def razobrat_konflikt(
-    lines: Iterable[str],
+    tekst: bytes,
     file_path: Path,
     root: Path,
     pravila: Sequence[Tuple[str, str]],
-) -> Tuple[List[str], List[str]]:
+) -> Tuple[bytes, List[str]]:
     """Объединяет конфликтные блоки согласно правилам и возвращает применённые стратегии."""
 
-    rezultat: List[str] = []
-    ours: List[str] = []
-    theirs: List[str] = []
+    rezultat: List[bytes] = []
+    ours: List[bytes] = []
+    theirs: List[bytes] = []
     sostoyanie = "normal"
     strategii: List[str] = []
     nomer_konflikta = 0
+    pozitsiya = 0
+    dlina = len(tekst)
+
+    while pozitsiya < dlina:
+        sovpadenie = RE_MARKER.search(tekst, pozitsiya)
+        konec_fragmenta = sovpadenie.start() if sovpadenie else dlina
+        if konec_fragmenta > pozitsiya:
+            fragment = tekst[pozitsiya:konec_fragmenta]
+            if sostoyanie == "ours":
+                ours.append(fragment)
+            elif sostoyanie == "theirs":
+                theirs.append(fragment)
+            else:
+                rezultat.append(fragment)
+        if sovpadenie is None:
+            break
 
-    for stroka in lines:
-        current = stroka
-        while current:
-            indeks, marker = _najti_marker(current)
-            if indeks > 0:
-                prefix = current[:indeks]
-                if prefix:
-                    if sostoyanie == "ours":
-                        ours.append(prefix)
-                    elif sostoyanie == "theirs":
-                        theirs.append(prefix)
-                    else:
-                        rezultat.append(prefix)
-                current = current[indeks:]
-                continue
-            if marker is None:
-                if sostoyanie == "ours":
-                    ours.append(current)
-                elif sostoyanie == "theirs":
-                    theirs.append(current)
-                else:
-                    rezultat.append(current)
-                break
-            if marker == KONFLIKT_START:
-                sostoyanie = "ours"
-                ours = []
-                theirs = []
-                nomer_konflikta += 1
-                current = _propustit_marker_stroki(current, KONFLIKT_START)
-                continue
-            if marker == KONFLIKT_DELIM:
-                sostoyanie = "theirs"
-                current = _propustit_marker_stroki(current, KONFLIKT_DELIM)
-                continue
-            if marker == KONFLIKT_END:
-                current = _propustit_marker_stroki(current, KONFLIKT_END)
-                vybor = vybrat_po_pravilam(file_path, root, pravila) or "both"
-                if vybor == "ours":
-                    rezultat.extend(ours)
-                elif vybor == "theirs":
-                    rezultat.extend(theirs)
-                else:
-                    rezultat.extend(ours)
-                    if theirs and ours and not ours[-1].endswith("\n"):
-                        rezultat.append("\n")
-                    rezultat.extend(theirs)
-                strategii.append(vybor)
-                LOGGER.info(
-                    "Conflict in %s (block %d): selected %s",
-                    file_path,
-                    nomer_konflikta,
-                    vybor,
-                )
-                sostoyanie = "normal"
-                continue
-    return rezultat, strategii
+        marker = sovpadenie.group()
+        konec_stroki = tekst.find(b"\n", sovpadenie.end())
+        konec_stroki = dlina if konec_stroki == -1 else konec_stroki + 1
+        # Метку маркера разбираем как str: строка заканчивается на любой границе
+        # str.splitlines (\r, U+0085, U+2028 ...), а пробелы в метке — любые
+        # пробелы Unicode, а не только ASCII. Остаток — суффикс строки, поэтому
+        # сканирование продолжается с его начала без копирования текста.
+        stroka = tekst[sovpadenie.start() : konec_stroki].decode("utf-8").splitlines(True)[0]
+        ostatok = _propustit_marker_stroki(stroka, marker.decode("ascii"))
+        pozitsiya = sovpadenie.start() + len(stroka.encode("utf-8")) - len(ostatok.encode("utf-8"))
+
+        if marker == KONFLIKT_START_BYTES:
+            sostoyanie = "ours"
+            ours = []
+            theirs = []
+            nomer_konflikta += 1
+        elif marker == KONFLIKT_DELIM_BYTES:
+            sostoyanie = "theirs"
+        else:
+            vybor = vybrat_po_pravilam(file_path, root, pravila) or "both"
+            if vybor == "ours":
+                rezultat.extend(ours)
+            elif vybor == "theirs":
+                rezultat.extend(theirs)
+            else:
+                rezultat.extend(ours)
+                if theirs and ours and not ours[-1].endswith(b"\n"):
+                    rezultat.append(b"\n")
+                rezultat.extend(theirs)
+            strategii.append(vybor)
+            LOGGER.info(
+                "Conflict in %s (block %d): selected %s",
+                file_path,
+                nomer_konflikta,
+                vybor,
+            )
+            sostoyanie = "normal"
+    return b"".join(rezultat), strategii
 
 
 class FileReport(TypedDict):
@@ -271,12 +266,19 @@ def obrabotat_fajl(
 ) -> FileReport:
     """Читает файл, устраняет конфликтные маркеры и возвращает отчёт."""
 
-    soderzhimoe = path.read_text(encoding="utf-8")
-    if KONFLIKT_START not in soderzhimoe:
+    # Маркеры конфликтов — ASCII, поэтому файл разбирается и записывается как байты
+    # без повторного кодирования UTF-8.
+    syrye = path.read_bytes()
+    if KONFLIKT_START_BYTES not in syrye:
         return {"file": str(path), "status": "clean", "strategy": None}
-    stroki = soderzhimoe.splitlines(keepends=True)
-    novye, strategii = razobrat_konflikt(stroki, path, root, pravila)
-    path.write_text("".join(novye), encoding="utf-8")
+    try:
+        # Двоичные файлы (объекты git, wasm, изображения) могут случайно
+        # содержать маркер; переписывать их нельзя.
+        syrye.decode("utf-8")
+    except UnicodeDecodeError:
+        return {"file": str(path), "status": "skipped", "strategy": None}
+    novoe, strategii = razobrat_konflikt(syrye, path, root, pravila)
+    path.write_bytes(novoe)
     strategiya = obobshit_strategiyu(strategii)
     return {"file": str(path), "status": "resolved", "strategy": strategiya}
 
@@ -305,13 +307,13 @@ def nayti_fajly(root: Path) -> List[Path]:
 def postroit_otchet(root: Path) -> ResolveReport:
     """Формирует итоговый отчёт по всем обработанным файлам."""
 
-    rezultaty: List[FileReport] = []
     pravila = postroit_pravila(root)
-    for fajl in nayti_fajly(root):
-        try:
-            rezultaty.append(obrabotat_fajl(fajl, root, pravila))
-        except UnicodeDecodeError:
-            rezultaty.append({"file": str(fajl), "status": "skipped", "strategy": None})
+    fajly = nayti_fajly(root)
+    if not fajly:
+        return {"files": []}
+    # Файлы независимы, а чтение и запись отпускают GIL — обрабатываем их пулом потоков.
+    with ThreadPoolExecutor(max_workers=min(MAKS_POTOKOV, len(fajly))) as pul:
+        rezultaty = list(pul.map(lambda fajl: obrabotat_fajl(fajl, root, pravila), fajly))
     return {"files": rezultaty}
 
 
@@ -322,9 +324,16 @@ def main(argv: List[str]) -> int:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     koren = Path.cwd()
     otchet = postroit_otchet(koren)
+    dannye = render_json(otchet)
     if args.report:
-        args.report.write_text(json.dumps(otchet, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(json.dumps(otchet, ensure_ascii=False, indent=2))
+        args.report.write_bytes(dannye)
+    bajtovyj_potok = getattr(sys.stdout, "buffer", None)
+    if bajtovyj_potok is None:
+        print(dannye.decode("utf-8"))
+    else:
+        sys.stdout.flush()
+        bajtovyj_potok.write(dannye + b"\n")
+        bajtovyj_potok.flush()
     return 0
 
 
@@ -1,8 +1,25 @@
 """Глобальная настройка pytest для импорта пакетов Kolibri."""
 
 import sys
+from collections.abc import Iterator
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def izolirovannyj_log_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Направляет трассировку KolibriSim во временный каталог сессии.
+
+    Без этого симулятор дописывает ``kolibri_trace.jsonl`` в текущий каталог,
+    и параллельные воркеры pytest-xdist пишут в один и тот же файл.
+    """
+
+    log_dir = tmp_path_factory.mktemp("kolibri_logs")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("KOLIBRI_LOG_DIR", str(log_dir))
+        yield log_dir
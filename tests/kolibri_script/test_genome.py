@@ -3,16 +3,11 @@
 from __future__ import annotations
 
 import json
-import sys
 from pathlib import Path
 
 import pytest
 
-ROOT = Path(__file__).resolve().parents[2]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
-from core.kolibri_script.genome import (  # noqa: E402
+from core.kolibri_script.genome import (
     KsdBlock,
     KsdValidationError,
     KolibriGenomeLedger,
@@ -20,7 +15,7 @@ from core.kolibri_script.genome import (  # noqa: E402
     load_secrets_config,
     serialize_ksd,
 )
-from core.kolibri_sim import KolibriSim  # noqa: E402
+from core.kolibri_sim import KolibriSim
 
 
 def _write_secrets(tmp_path: Path) -> Path:
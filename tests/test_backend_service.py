@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import os
 from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any, Dict
 
 import pytest
@@ -11,47 +14,67 @@ from backend.service.app import app, create_app
 from backend.service.config import get_settings
 from backend.service.security import AuthContext, issue_session_token
 from backend.service.profiles import reset_profile_store
+from backend.service.routes.health import health
 
 
-@pytest.fixture(autouse=True)
-def clear_settings_cache(monkeypatch: pytest.MonkeyPatch) -> None:
-    for key in (
-        "KOLIBRI_RESPONSE_MODE",
-        "KOLIBRI_LLM_ENDPOINT",
-        "KOLIBRI_LLM_API_KEY",
-        "KOLIBRI_LLM_MODEL",
-        "KOLIBRI_LLM_TIMEOUT",
-        "KOLIBRI_LLM_TEMPERATURE",
-        "KOLIBRI_LLM_MAX_TOKENS",
-        "KOLIBRI_SSO_ENABLED",
-        "KOLIBRI_SSO_SHARED_SECRET",
-        "KOLIBRI_SSO_SESSION_TTL",
-        "KOLIBRI_SSO_OFFLINE_ROLES",
-        "KOLIBRI_SSO_DEGRADED_TOKENS",
-        "KOLIBRI_SAML_ENTITY_ID",
-        "KOLIBRI_SAML_ACS_URL",
-        "KOLIBRI_SAML_AUDIENCE",
-        "KOLIBRI_SAML_ROLE_ATTRIBUTE",
-        "KOLIBRI_SAML_SIGNATURE_ATTRIBUTE",
-        "KOLIBRI_SAML_CLOCK_SKEW",
-        "KOLIBRI_AUDIT_LOG_PATH",
-        "KOLIBRI_GENOME_LOG_PATH",
-        "KOLIBRI_PROMETHEUS_NAMESPACE",
-        "KOLIBRI_LOG_LEVEL",
-        "KOLIBRI_LOG_JSON",
-    ):
-        monkeypatch.delenv(key, raising=False)
+SETTINGS_ENV_PREFIX = "KOLIBRI_"
+SSO_SHARED_SECRET = "testing-secret"
+
+
+def _pop_settings_env() -> Dict[str, str]:
+    keys = [key for key in os.environ if key.startswith(SETTINGS_ENV_PREFIX)]
+    return {key: os.environ.pop(key) for key in keys}
+
+
+@contextmanager
+def _isolated_settings_env() -> Iterator[None]:
+    """Hide the developer's KOLIBRI_* variables and restore them on exit."""
+
+    saved = _pop_settings_env()
     get_settings.cache_clear()
-    reset_actions_registry()
-    reset_profile_store()
+    try:
+        yield
+    finally:
+        _pop_settings_env()
+        os.environ.update(saved)
+        get_settings.cache_clear()
+
 
+@pytest.fixture(autouse=True)
+def clear_settings_cache() -> Iterator[None]:
+    with _isolated_settings_env():
+        reset_actions_registry()
+        reset_profile_store()
+        yield
 
-@pytest.fixture()
+
+@pytest.fixture(scope="module")
 def client() -> Iterator[TestClient]:
-    with TestClient(app) as test_client:
+    # The app lifespan runs once per module; settings are still reset per test
+    # by clear_settings_cache. Module fixtures are set up before that autouse
+    # fixture, so the lifespan gets its own clean environment.
+    with _isolated_settings_env(), TestClient(app) as test_client:
         yield test_client
 
 
+@pytest.fixture(scope="module")
+def valid_bearer_token() -> str:
+    # Signed once per module; tests that send it must configure the same
+    # KOLIBRI_SSO_SHARED_SECRET, since clear_settings_cache wipes it per test.
+    with _isolated_settings_env(), pytest.MonkeyPatch.context() as patch:
+        patch.setenv("KOLIBRI_SSO_SHARED_SECRET", SSO_SHARED_SECRET)
+        settings = get_settings()
+        context = AuthContext(
+            subject="user@example.com",
+            roles={"system:admin"},
+            attributes={},
+            session_expires_at=None,
+            session_id="test",
+        )
+        token = issue_session_token(context, settings)
+    return f"Bearer {token}"
+
+
 def test_lifespan_configures_logging(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("KOLIBRI_LOG_LEVEL", "DEBUG")
     monkeypatch.setenv("KOLIBRI_LOG_JSON", "false")
@@ -71,14 +94,15 @@ def test_lifespan_configures_logging(monkeypatch: pytest.MonkeyPatch) -> None:
     assert calls == [("DEBUG", False)]
 
 
-def test_health_reports_response_mode(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+def test_health_reports_response_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Pure handler output: call the coroutine directly instead of going through
+    # the ASGI stack (test_lifespan_configures_logging already hits the route).
     monkeypatch.setenv("KOLIBRI_RESPONSE_MODE", "script")
     get_settings.cache_clear()
 
-    response = client.get("/api/health")
-    assert response.status_code == 200
-    payload = response.json()
-    assert payload["response_mode"] == "script"
+    payload = asyncio.run(health(get_settings()))
+    assert payload.status == "ok"
+    assert payload.response_mode == "script"
 
 
 def test_infer_disabled_when_not_llm(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
@@ -129,12 +153,8 @@ class _DummyClient:
         return _DummyResponse()
 
 
-def test_infer_success(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
-    monkeypatch.setenv("KOLIBRI_RESPONSE_MODE", "llm")
-    monkeypatch.setenv("KOLIBRI_LLM_ENDPOINT", "https://example.test/llm")
-    monkeypatch.setenv("KOLIBRI_SSO_ENABLED", "false")
-    get_settings.cache_clear()
-
+@pytest.fixture
+def dummy_httpx(monkeypatch: pytest.MonkeyPatch) -> _DummyClient:
     dummy_client = _DummyClient()
 
     def factory(*args: Any, **kwargs: Any) -> _DummyClient:
@@ -143,6 +163,16 @@ def test_infer_success(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> N
         return dummy_client
 
     monkeypatch.setattr("backend.service.routes.inference.httpx.AsyncClient", factory)
+    return dummy_client
+
+
+def test_infer_success(
+    monkeypatch: pytest.MonkeyPatch, client: TestClient, dummy_httpx: _DummyClient
+) -> None:
+    monkeypatch.setenv("KOLIBRI_RESPONSE_MODE", "llm")
+    monkeypatch.setenv("KOLIBRI_LLM_ENDPOINT", "https://example.test/llm")
+    monkeypatch.setenv("KOLIBRI_SSO_ENABLED", "false")
+    get_settings.cache_clear()
 
     response = client.post("/api/v1/infer", json={"prompt": "ping", "mode": "test"})
 
@@ -152,13 +182,15 @@ def test_infer_success(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> N
     assert payload["provider"] == "test-provider"
     assert payload["latency_ms"] >= 0
 
-    assert dummy_client.post_calls
-    sent_json = dummy_client.post_calls[0]["kwargs"]["json"]
+    assert dummy_httpx.post_calls
+    sent_json = dummy_httpx.post_calls[0]["kwargs"]["json"]
     assert sent_json["prompt"] == "ping"
     assert sent_json["mode"] == "test"
 
 
-def test_infer_applies_defaults(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+def test_infer_applies_defaults(
+    monkeypatch: pytest.MonkeyPatch, client: TestClient, dummy_httpx: _DummyClient
+) -> None:
     monkeypatch.setenv("KOLIBRI_RESPONSE_MODE", "llm")
     monkeypatch.setenv("KOLIBRI_LLM_ENDPOINT", "https://example.test/llm")
     monkeypatch.setenv("KOLIBRI_LLM_TEMPERATURE", "0.9")
@@ -166,19 +198,10 @@ def test_infer_applies_defaults(monkeypatch: pytest.MonkeyPatch, client: TestCli
     monkeypatch.setenv("KOLIBRI_SSO_ENABLED", "false")
     get_settings.cache_clear()
 
-    dummy_client = _DummyClient()
-
-    def factory(*args: Any, **kwargs: Any) -> _DummyClient:
-        dummy_client.args = args
-        dummy_client.kwargs = kwargs
-        return dummy_client
-
-    monkeypatch.setattr("backend.service.routes.inference.httpx.AsyncClient", factory)
-
     response = client.post("/api/v1/infer", json={"prompt": "ping"})
 
     assert response.status_code == 200
-    sent_json = dummy_client.post_calls[0]["kwargs"]["json"]
+    sent_json = dummy_httpx.post_calls[0]["kwargs"]["json"]
     assert sent_json["temperature"] == pytest.approx(0.9)
     assert sent_json["max_tokens"] == 256
 
@@ -199,7 +222,7 @@ def test_invalid_defaults_raise(monkeypatch: pytest.MonkeyPatch, env_key: str) -
 def test_infer_requires_auth_when_sso_enabled(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
     monkeypatch.setenv("KOLIBRI_RESPONSE_MODE", "llm")
     monkeypatch.setenv("KOLIBRI_LLM_ENDPOINT", "https://example.test/llm")
-    monkeypatch.setenv("KOLIBRI_SSO_SHARED_SECRET", "testing-secret")
+    monkeypatch.setenv("KOLIBRI_SSO_SHARED_SECRET", SSO_SHARED_SECRET)
     get_settings.cache_clear()
 
     response = client.post("/api/v1/infer", json={"prompt": "ping"})
@@ -207,33 +230,25 @@ def test_infer_requires_auth_when_sso_enabled(monkeypatch: pytest.MonkeyPatch, c
     assert response.json()["detail"] == "Missing bearer token"
 
 
-def test_infer_accepts_valid_token(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+def test_infer_accepts_valid_token(
+    monkeypatch: pytest.MonkeyPatch,
+    client: TestClient,
+    dummy_httpx: _DummyClient,
+    valid_bearer_token: str,
+) -> None:
     monkeypatch.setenv("KOLIBRI_RESPONSE_MODE", "llm")
     monkeypatch.setenv("KOLIBRI_LLM_ENDPOINT", "https://example.test/llm")
-    monkeypatch.setenv("KOLIBRI_SSO_SHARED_SECRET", "testing-secret")
+    monkeypatch.setenv("KOLIBRI_SSO_SHARED_SECRET", SSO_SHARED_SECRET)
     get_settings.cache_clear()
 
-    dummy_client = _DummyClient()
-
-    def factory(*args: Any, **kwargs: Any) -> _DummyClient:
-        dummy_client.args = args
-        dummy_client.kwargs = kwargs
-        return dummy_client
-
-    monkeypatch.setattr("backend.service.routes.inference.httpx.AsyncClient", factory)
-
-    settings = get_settings()
-    context = AuthContext(subject="user@example.com", roles={"system:admin"}, attributes={}, session_expires_at=None, session_id="test")
-    token = issue_session_token(context, settings)
-
     response = client.post(
         "/api/v1/infer",
         json={"prompt": "ping"},
-        headers={"Authorization": f"Bearer {token}"},
+        headers={"Authorization": valid_bearer_token},
     )
 
     assert response.status_code == 200
-    assert dummy_client.post_calls
+    assert dummy_httpx.post_calls
 
 
 def test_intent_resolution_returns_prompts(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from scripts import json_output
+
+PAYLOAD = {"files": [{"path": "заметки.md", "status": "resolved", "conflicts": 2}], "ratio": 0.5}
+
+
+def test_stdlib_fallback_renders_indented_utf8(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(json_output, "orjson", None)
+
+    rendered = json_output.render_json(PAYLOAD)
+
+    assert rendered == json.dumps(PAYLOAD, ensure_ascii=False, indent=2).encode("utf-8")
+    assert "заметки.md".encode("utf-8") in rendered
+
+
+def test_trailing_newline_is_appended_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(json_output, "orjson", None)
+
+    rendered = json_output.render_json(PAYLOAD, trailing_newline=True)
+
+    assert rendered.endswith(b"}\n")
+    assert json.loads(rendered) == PAYLOAD
+
+
+def test_orjson_matches_stdlib_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("orjson")
+    fast = json_output.render_json(PAYLOAD, trailing_newline=True)
+    monkeypatch.setattr(json_output, "orjson", None)
+
+    assert fast == json_output.render_json(PAYLOAD, trailing_newline=True)
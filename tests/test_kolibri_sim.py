@@ -4,15 +4,10 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-import sys
 
-ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+import pytest
 
-import pytest  # noqa: E402
-
-from core.kolibri_sim import (  # noqa: E402
+from core.kolibri_sim import (
     KolibriSim,
     dec_hash,
     dolzhen_zapustit_repl,
@@ -24,7 +19,7 @@ from core.kolibri_sim import (  # noqa: E402
     ZapisBloka,
     ZhurnalZapis,
 )
-from core.tracing import JsonLinesTracer  # noqa: E402
+from core.tracing import JsonLinesTracer
 
 
 # --- Базовые тесты (T1–T7) -------------------------------------------------
@@ -1,32 +1,39 @@
 import json
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
 
 import pytest
 
 from training import build_learning_journey, load_program_from_mapping
+from training.mentorship import MENTOR_INDEX_THRESHOLD, RECOMMENDED_COURSES_LIMIT
 from scripts import mentorship_program
 
 
-@pytest.fixture()
-def sample_program() -> dict:
-    return {
-        "sessions_per_week": 2,
-        "courses": [
-            {"id": "ml-basics", "competencies": ["ml", "python"], "lab_required": True},
-            {"id": "observability", "competencies": ["logging", "metrics"]},
-            {"id": "ethics", "competencies": ["ethics"], "duration_hours": 2},
-        ],
-        "mentors": [
-            {"name": "Ирина", "specialization": ["ml", "python", "ethics"], "capacity": 2},
-            {"name": "Дмитрий", "specialization": ["metrics"], "capacity": 1},
-        ],
-        "mentees": [
-            {"name": "Алекс", "goals": ["ml", "ethics"], "baseline_score": 0.4},
-        ],
-    }
-
-
-def test_learning_journey_covers_weeks(sample_program: dict) -> None:
+@pytest.fixture(scope="session")
+def sample_program() -> Mapping[str, Any]:
+    # Общая для всех тестов и доступная только для чтения: тесты, которым
+    # нужно дополнить программу, собирают собственную копию.
+    return MappingProxyType(
+        {
+            "sessions_per_week": 2,
+            "courses": (
+                {"id": "ml-basics", "competencies": ["ml", "python"], "lab_required": True},
+                {"id": "observability", "competencies": ["logging", "metrics"]},
+                {"id": "ethics", "competencies": ["ethics"], "duration_hours": 2},
+            ),
+            "mentors": (
+                {"name": "Ирина", "specialization": ["ml", "python", "ethics"], "capacity": 2},
+                {"name": "Дмитрий", "specialization": ["metrics"], "capacity": 1},
+            ),
+            "mentees": (
+                {"name": "Алекс", "goals": ["ml", "ethics"], "baseline_score": 0.4},
+            ),
+        }
+    )
+
+
+def test_learning_journey_covers_weeks(sample_program: Mapping[str, Any]) -> None:
     program = load_program_from_mapping(sample_program)
     result = build_learning_journey(program, weeks=3, target_score=0.9)
     sessions = result.sessions
@@ -38,11 +45,13 @@ def test_learning_journey_covers_weeks(sample_program: dict) -> None:
     assert summary.mentor_utilization["Ирина"] > 0
 
 
-def test_summary_tracks_uncovered_goals(sample_program: dict) -> None:
-    sample_program["mentees"].append(
-        {"name": "Мария", "goals": ["ml", "governance"], "baseline_score": 0.2}
+def test_summary_tracks_uncovered_goals(sample_program: Mapping[str, Any]) -> None:
+    config = dict(sample_program)
+    config["mentees"] = (
+        *sample_program["mentees"],
+        {"name": "Мария", "goals": ["ml", "governance"], "baseline_score": 0.2},
     )
-    program = load_program_from_mapping(sample_program)
+    program = load_program_from_mapping(config)
     result = build_learning_journey(program, weeks=2, target_score=0.8)
     summary = result.summary(program)
 
@@ -51,9 +60,88 @@ def test_summary_tracks_uncovered_goals(sample_program: dict) -> None:
     assert "ml-basics" in summary.recommended_courses["Мария"]
 
 
-def test_cli_generates_schedule(tmp_path: Path, sample_program: dict) -> None:
+def test_mentor_without_capacity_is_skipped(sample_program: Mapping[str, Any]) -> None:
+    config = dict(sample_program)
+    config["mentors"] = (
+        {"name": "Олег", "specialization": ["ml", "ethics"], "capacity": 0},
+        *sample_program["mentors"],
+    )
+    program = load_program_from_mapping(config)
+
+    assert program.mentor_for(program.mentees[0]).name == "Ирина"
+
+
+def test_large_program_picks_same_mentor_as_small(sample_program: Mapping[str, Any]) -> None:
+    # Выше ``MENTOR_INDEX_THRESHOLD`` подбор идёт через обратный индекс,
+    # но результат должен совпадать с линейным перебором.
+    config = dict(sample_program)
+    config["mentors"] = (
+        {"name": "Олег", "specialization": ["ml", "ethics"], "capacity": 0},
+        *(
+            {"name": f"Гость {index}", "specialization": ["ml"], "capacity": 1}
+            for index in range(MENTOR_INDEX_THRESHOLD)
+        ),
+        *sample_program["mentors"],
+    )
+    program = load_program_from_mapping(config)
+
+    assert len(program.mentors) >= MENTOR_INDEX_THRESHOLD
+    assert program.mentor_for(program.mentees[0]).name == "Ирина"
+
+
+def test_replacing_courses_refreshes_recommendations(sample_program: Mapping[str, Any]) -> None:
+    program = load_program_from_mapping(sample_program)
+    first = build_learning_journey(program, weeks=1)
+    assert "ml-basics" in first.recommended_courses["Алекс"]
+
+    program.courses = tuple(
+        course for course in program.courses if course.course_id != "ml-basics"
+    )
+    second = build_learning_journey(program, weeks=1)
+
+    assert "ml-basics" not in second.recommended_courses["Алекс"]
+    assert {session.course_id for session in second.sessions} <= {"ethics", "observability"}
+
+
+def test_course_plan_matches_recommendations(sample_program: Mapping[str, Any]) -> None:
+    program = load_program_from_mapping(sample_program)
+    mentee = program.mentees[0]
+
+    course_ids, foci, covered = program.course_plan(mentee.goals_norm)
+
+    recommended = program.recommend_courses(mentee)
+    assert len(recommended) == min(RECOMMENDED_COURSES_LIMIT, len(program.courses))
+    assert course_ids == tuple(course.course_id for course in recommended)
+    assert foci == tuple(
+        "лаборатория" if course.lab_required else "семинар" for course in recommended
+    )
+    assert covered >= {"ml", "ethics"}
+    assert program.mentor_for_goals(mentee.goals_norm) == program.mentor_for(mentee)
+
+
+@pytest.mark.parametrize("goals", [["ML", "metrics"], ("ml", "Metrics"), iter(["ml", "metrics"])])
+def test_coverage_ratio_accepts_any_iterable(
+    sample_program: Mapping[str, Any], goals: Any
+) -> None:
+    program = load_program_from_mapping(sample_program)
+
+    assert program.courses[0].coverage_ratio(goals) == 0.5
+
+
+def test_generate_schedule_builds_payload(sample_program: Mapping[str, Any]) -> None:
+    data = mentorship_program.generate_schedule(
+        sample_program, weeks=2, target_score=0.9, include_summary=True
+    )
+
+    assert any(item["focus"] == "лаборатория" for item in data["sessions"])
+    assert all(item["mentor"] == "Ирина" for item in data["sessions"])
+    assert "summary" in data
+    assert data["summary"]["mentor_utilization"]["Ирина"] > 0
+
+
+def test_cli_generates_schedule(tmp_path: Path, sample_program: Mapping[str, Any]) -> None:
     config_path = tmp_path / "program.json"
-    config_path.write_text(json.dumps(sample_program, ensure_ascii=False), encoding="utf-8")
+    config_path.write_text(json.dumps(dict(sample_program), ensure_ascii=False), encoding="utf-8")
     output_path = tmp_path / "schedule.json"
 
     exit_code = mentorship_program.main(
@@ -71,7 +159,6 @@ def test_cli_generates_schedule(tmp_path: Path, sample_program: dict) -> None:
 
     assert exit_code == 0
     data = json.loads(output_path.read_text(encoding="utf-8"))
-    assert any(item["focus"] == "лаборатория" for item in data["sessions"])
-    assert all(item["mentor"] == "Ирина" for item in data["sessions"])
-    assert "summary" in data
-    assert data["summary"]["mentor_utilization"]["Ирина"] > 0
+    assert data == mentorship_program.generate_schedule(
+        sample_program, weeks=2, target_score=0.9, include_summary=True
+    )
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+
+from scripts import policy_validate
+
+BLOK = """build: ours
+code: ours
+docs: ours
+
+files:
+  prefer_ours:
+    - backend/**
+  prefer_theirs:
+    - docs/**
+
+budgets:
+  wasm_max_kb: 61440
+  step_latency_ms: 250
+  coverage_min_lines: 75
+  coverage_min_branches: 60
+"""
+
+
+def _proverit_files(blok: str) -> None:
+    policy_validate.proverit_klyuchi(
+        policy_validate.RE_FILES_KEYS,
+        blok,
+        policy_validate.REQUIRED_FILES_KEYS,
+        "files/{klyuch}",
+    )
+
+
+def test_repository_policy_is_valid(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    monkeypatch.chdir(Path(__file__).resolve().parents[1])
+
+    policy_validate.main()
+
+    assert capsys.readouterr().out.strip() == "policy: OK"
+
+
+def test_bare_list_item_does_not_swallow_next_key() -> None:
+    blok = BLOK.replace("    - backend/**\n", "    -\n")
+
+    _proverit_files(blok)
+
+
+def test_missing_files_key_is_reported() -> None:
+    blok = BLOK.replace("  prefer_theirs:\n    - docs/**\n", "")
+
+    with pytest.raises(SystemExit, match="files/prefer_theirs"):
+        _proverit_files(blok)
@@ -1,21 +1,16 @@
+import json
 import logging
-import sys
 from pathlib import Path
 from typing import List, Optional
 
 import pytest
 
-ROOT = Path(__file__).resolve().parents[1]
-if ROOT.name == "tests":
-    ROOT = ROOT.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
-from scripts.resolve_conflicts import (  # noqa: E402
+from scripts.resolve_conflicts import (
     KONFLIKT_DELIM,
     KONFLIKT_END,
     KONFLIKT_START,
     ResolveReport,
+    main,
     postroit_otchet,
 )
 
@@ -124,3 +119,70 @@ def test_prefers_theirs_multiple_conflicts(tmp_path: Path, agents_content: str)
     assert target.read_text(encoding="utf-8") == expected
     entry = next(item for item in report["files"] if item["file"] == str(target))
     assert entry["strategy"] == "theirs"
+
+
+@pytest.mark.parametrize("razdelitel", ["\u2028", "\x85", "\r"])
+def test_marker_label_ends_at_unicode_line_break(
+    tmp_path: Path, agents_content: str, razdelitel: str
+) -> None:
+    (tmp_path / "AGENTS.md").write_text(agents_content, encoding="utf-8")
+    target = tmp_path / "notes.txt"
+    target.write_bytes(
+        f"{KONFLIKT_START} HEAD{razdelitel}ours\n{KONFLIKT_DELIM}\ntheirs\n{KONFLIKT_END} b\n".encode(
+            "utf-8"
+        )
+    )
+
+    postroit_otchet(tmp_path)
+
+    assert target.read_bytes().decode("utf-8") == "ours\ntheirs\n"
+
+
+def test_report_covers_mixed_files(tmp_path: Path, agents_content: str) -> None:
+    (tmp_path / "AGENTS.md").write_text(agents_content, encoding="utf-8")
+    konflikty = [tmp_path / f"conflict_{index}.txt" for index in range(8)]
+    for path in konflikty:
+        zapisat_conflict(path, ["ours"], ["theirs"])
+    clean = tmp_path / "clean.txt"
+    clean.write_text("nothing to do\n", encoding="utf-8")
+    binary = tmp_path / "binary.bin"
+    binary_bytes = (
+        f"{KONFLIKT_START} ours\n".encode("ascii")
+        + b"\xff\xfe\n"
+        + f"{KONFLIKT_DELIM}\n".encode("ascii")
+        + b"\x00\x01\n"
+        + f"{KONFLIKT_END} theirs\n".encode("ascii")
+    )
+    binary.write_bytes(binary_bytes)
+
+    report = postroit_otchet(tmp_path)
+
+    statusy = {item["file"]: item["status"] for item in report["files"]}
+    assert all(statusy[str(path)] == "resolved" for path in konflikty)
+    assert statusy[str(clean)] == "clean"
+    assert statusy[str(binary)] == "skipped"
+    assert binary.read_bytes() == binary_bytes
+    for path in konflikty:
+        assert path.read_text(encoding="utf-8") == "prelude\nours\ntheirs\nepilogue\n"
+
+
+def test_main_writes_report_in_process(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    agents_content: str,
+) -> None:
+    (tmp_path / "AGENTS.md").write_text(agents_content, encoding="utf-8")
+    conflict = tmp_path / "scripts" / "tool.py"
+    conflict.parent.mkdir(parents=True)
+    zapisat_conflict(conflict, ["ours-line"], ["theirs-line"])
+    report_path = tmp_path / "report.json"
+    monkeypatch.chdir(tmp_path)
+
+    exit_code = main(["--report", str(report_path)])
+
+    assert exit_code == 0
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert json.loads(capsys.readouterr().out) == report
+    entry = next(item for item in report["files"] if item["file"] == str(conflict))
+    assert entry == {"file": str(conflict), "status": "resolved", "strategy": "ours"}
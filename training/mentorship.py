@@ -9,8 +9,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable, Mapping
+import heapq
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from itertools import cycle, islice, product
+from typing import Callable, Dict, Iterable, Mapping, TypeVar
 
 
 @dataclass(frozen=True, slots=True)
@@ -41,10 +44,10 @@ class Mentor:
     specialization: frozenset[str]
     capacity: int
 
-    def supports(self, goals: Iterable[str]) -> int:
-        """Количество совпадающих целей."""
+    def supports(self, goals_set: frozenset[str]) -> int:
+        """Количество совпадающих целей (цели уже в нижнем регистре)."""
 
-        return len(self.specialization & frozenset(goal.lower() for goal in goals))
+        return len(self.specialization & goals_set)
 
 
 @dataclass(frozen=True, slots=True)
@@ -54,6 +57,12 @@ class Mentee:
     name: str
     goals: tuple[str, ...]
     baseline_score: float
+    goals_norm: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Цели в нижнем регистре считаются один раз при создании участника,
+        # а не в каждом подборе ментора и курсов.
+        object.__setattr__(self, "goals_norm", frozenset(goal.lower() for goal in self.goals))
 
 
 @dataclass(frozen=True, slots=True)
@@ -133,6 +142,16 @@ class JourneyResult:
         )
 
 
+RECOMMENDED_COURSES_LIMIT = 3
+PLAN_CACHE_SIZE = 256
+MENTOR_INDEX_THRESHOLD = 32
+
+# Идентификаторы рекомендованных курсов, форматы занятий и покрытые компетенции.
+CoursePlan = tuple[tuple[str, ...], tuple[str, ...], frozenset[str]]
+
+_T = TypeVar("_T")
+
+
 @dataclass(slots=True)
 class MentorshipProgram:
     """Конфигурация программы наставничества."""
@@ -141,34 +160,161 @@ class MentorshipProgram:
     mentors: tuple[Mentor, ...]
     mentees: tuple[Mentee, ...]
     sessions_per_week: int = 1
+    _derived: Dict[str, tuple[object, object]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def _derived_value(self, name: str, source: object, build: Callable[[], _T]) -> _T:
+        """Значение, производное от ``source``, пересобираемое при его замене.
+
+        ``courses`` и ``mentors`` заменяются целиком, поэтому актуальность
+        проверяется по идентичности кортежа, а не по содержимому.
+        """
+
+        cached = self._derived.get(name)
+        if cached is None or cached[0] is not source:
+            cached = self._derived[name] = (source, build())
+        return cached[1]  # type: ignore[return-value]
 
     def mentor_for(self, mentee: Mentee) -> Mentor:
         """Выбрать лучшего доступного ментора."""
 
-        best: Mentor | None = None
-        best_score = -1
+        return self.mentor_for_goals(mentee.goals_norm)
+
+    def mentor_for_goals(self, goals_set: frozenset[str]) -> Mentor:
+        """Лучший ментор со свободными слотами; при равенстве — стоящий раньше.
+
+        Цели передаются уже нормализованными (в нижнем регистре).
+
+        В небольших программах (до ``MENTOR_INDEX_THRESHOLD`` менторов)
+        линейный перебор с выходом на полном совпадении целей быстрее, чем
+        подсчёт очков по индексу. В крупных обратный индекс окупается: очки
+        получают только менторы из списков совпавших компетенций.
+        """
+
+        if len(self.mentors) < MENTOR_INDEX_THRESHOLD:
+            best: Mentor | None = None
+            best_score = -1
+            perfect_score = len(goals_set)
+            for mentor in self.mentors:
+                if mentor.capacity <= 0:
+                    continue
+                score = mentor.supports(goals_set)
+                if score > best_score:
+                    best = mentor
+                    best_score = score
+                    if score == perfect_score:
+                        break
+            if best is None:
+                raise ValueError("Нет доступных менторов для программы")
+            return best
+
+        postings = self._mentor_index()
+        scores = Counter(
+            position for goal in goals_set for position in postings.get(goal, ())
+        )
+        if scores:
+            position, _ = max(scores.items(), key=lambda item: (item[1], -item[0]))
+            return self.mentors[position]
         for mentor in self.mentors:
-            score = mentor.supports(mentee.goals)
-            if score > best_score:
-                best = mentor
-                best_score = score
-        if best is None:
-            raise ValueError("Нет доступных менторов для программы")
-        return best
-
-    def recommend_courses(self, mentee: Mentee, *, limit: int = 3) -> list[Course]:
+            if mentor.capacity > 0:
+                return mentor
+        raise ValueError("Нет доступных менторов для программы")
+
+    def _mentor_index(self) -> Dict[str, tuple[int, ...]]:
+        """Обратный индекс «компетенция → позиции менторов со слотами»."""
+
+        def build() -> Dict[str, tuple[int, ...]]:
+            postings: Dict[str, list[int]] = defaultdict(list)
+            for position, mentor in enumerate(self.mentors):
+                if mentor.capacity <= 0:
+                    continue
+                for competency in mentor.specialization:
+                    postings[competency].append(position)
+            return {competency: tuple(items) for competency, items in postings.items()}
+
+        return self._derived_value("mentor_index", self.mentors, build)
+
+    def recommend_courses(
+        self, mentee: Mentee, *, limit: int = RECOMMENDED_COURSES_LIMIT
+    ) -> list[Course]:
         """Подбор курсов по степени покрытия целей и энергоэффективности."""
 
-        sorted_courses = sorted(
-            self.courses,
-            key=lambda course: (
-                course.coverage_ratio(mentee.goals),
-                -course.duration_hours,
-                course.lab_required,
-            ),
-            reverse=True,
+        return self._rank_courses(mentee.goals_norm, limit)
+
+    def course_plan(self, goals_set: frozenset[str]) -> CoursePlan:
+        """План курсов для набора целей: идентификаторы, форматы и покрытие.
+
+        Участники когорты часто делят одни и те же цели, поэтому план
+        кэшируется по ``goals_set`` до замены ``courses``. Кэш ограничен
+        ``PLAN_CACHE_SIZE`` записями и вытесняет самые старые.
+        """
+
+        plans: Dict[frozenset[str], CoursePlan] = self._derived_value(
+            "course_plans", self.courses, dict
         )
-        return sorted_courses[:limit]
+        plan = plans.get(goals_set)
+        if plan is None:
+            recommended = self._rank_courses(goals_set, RECOMMENDED_COURSES_LIMIT)
+            plan = (
+                tuple(course.course_id for course in recommended),
+                tuple(
+                    "лаборатория" if course.lab_required else "семинар"
+                    for course in recommended
+                ),
+                frozenset(value for course in recommended for value in course.competencies),
+            )
+            if len(plans) >= PLAN_CACHE_SIZE:
+                del plans[next(iter(plans))]
+            plans[goals_set] = plan
+        return plan
+
+    def _rank_courses(self, goals_set: frozenset[str], limit: int) -> list[Course]:
+        goals_total = len(goals_set)
+        courses = self.courses
+        bits, masks = self._competency_masks()
+        goal_mask = 0
+        for goal in goals_set:
+            bit = bits.get(goal)
+            if bit is not None:
+                goal_mask |= 1 << bit
+
+        def rank(index: int) -> tuple[float, int, bool]:
+            course = courses[index]
+            coverage = (masks[index] & goal_mask).bit_count() / goals_total if goals_total else 0.0
+            return coverage, -course.duration_hours, course.lab_required
+
+        # Нужны только первые ``limit`` курсов: куча вместо полной сортировки.
+        return [courses[index] for index in heapq.nlargest(limit, range(len(courses)), key=rank)]
+
+    def _competency_masks(self) -> tuple[Dict[str, int], tuple[int, ...]]:
+        """Битовые маски компетенций курсов; пересобираются при замене ``courses``.
+
+        Покрытие целей курсом сводится к ``&`` и ``bit_count`` над целыми
+        числами вместо пересечения множеств для каждой пары курс/участник.
+        """
+
+        def build() -> tuple[Dict[str, int], tuple[int, ...]]:
+            bits: Dict[str, int] = {}
+            masks: list[int] = []
+            for course in self.courses:
+                mask = 0
+                for competency in course.competencies:
+                    mask |= 1 << bits.setdefault(competency, len(bits))
+                masks.append(mask)
+            return bits, tuple(masks)
+
+        return self._derived_value("competency_masks", self.courses, build)
+
+
+def _normalize_tokens(values: Iterable[object]) -> frozenset[str]:
+    """Привести компетенции к строкам в нижнем регистре.
+
+    Списковое включение обходится без кадра генератора на каждый элемент —
+    заметно на конфигурациях с тысячами курсов и менторов.
+    """
+
+    return frozenset([str(value).lower() for value in values])
 
 
 def load_program_from_mapping(config: Mapping[str, object]) -> MentorshipProgram:
@@ -187,9 +333,7 @@ def load_program_from_mapping(config: Mapping[str, object]) -> MentorshipProgram
             course_id=str(item["id"]),
             title=str(item.get("title", item["id"])),
             duration_hours=int(item.get("duration_hours", 4)),
-            competencies=frozenset(
-                str(value).lower() for value in item.get("competencies", ())
-            ),
+            competencies=_normalize_tokens(item.get("competencies", ())),
             lab_required=bool(item.get("lab_required", False)),
         )
         for item in courses_raw  # type: ignore[arg-type]
@@ -197,9 +341,7 @@ def load_program_from_mapping(config: Mapping[str, object]) -> MentorshipProgram
     mentors = tuple(
         Mentor(
             name=str(item["name"]),
-            specialization=frozenset(
-                str(value).lower() for value in item.get("specialization", ())
-            ),
+            specialization=_normalize_tokens(item.get("specialization", ())),
             capacity=int(item.get("capacity", 1)),
         )
         for item in mentors_raw  # type: ignore[arg-type]
@@ -207,7 +349,7 @@ def load_program_from_mapping(config: Mapping[str, object]) -> MentorshipProgram
     mentees = tuple(
         Mentee(
             name=str(item["name"]),
-            goals=tuple(str(value) for value in item.get("goals", ())),
+            goals=tuple([str(value) for value in item.get("goals", ())]),
             baseline_score=float(item.get("baseline_score", 0.0)),
         )
         for item in mentees_raw  # type: ignore[arg-type]
@@ -233,25 +375,32 @@ def build_learning_journey(
     uncovered_goals: Dict[str, tuple[str, ...]] = {}
     recommended_courses: Dict[str, tuple[str, ...]] = {}
 
+    # Участники с одинаковым набором целей получают одного и того же ментора,
+    # поэтому выбор кэшируется по нормализованным целям.
+    mentor_by_goals: Dict[frozenset[str], Mentor] = {}
+
     for mentee in program.mentees:
-        mentor = program.mentor_for(mentee)
+        goals_key = mentee.goals_norm
+        mentor = mentor_by_goals.get(goals_key)
+        if mentor is None:
+            mentor = mentor_by_goals[goals_key] = program.mentor_for_goals(goals_key)
         available_capacity = mentor.capacity * weeks * program.sessions_per_week
-        remaining_capacity = available_capacity - mentor_load[mentor.name]
+        # Нагрузка ментора копится в локальной переменной и записывается
+        # в словарь один раз в конце итерации.
+        load = mentor_load[mentor.name]
+        remaining_capacity = available_capacity - load
         if remaining_capacity <= 0:
             raise ValueError(f"У ментора {mentor.name} нет слотов для занятий")
 
-        recommended = program.recommend_courses(mentee)
-        if not recommended:
+        course_ids, foci, covered_competencies = program.course_plan(goals_key)
+        if not course_ids:
             raise ValueError(f"Для участника {mentee.name} не найдено подходящих курсов")
 
-        recommended_courses[mentee.name] = tuple(course.course_id for course in recommended)
-        covered_competencies = {
-            value for course in recommended for value in course.competencies
-        }
-        goals = tuple(goal.lower() for goal in mentee.goals)
+        n_courses = len(course_ids)
+        recommended_courses[mentee.name] = course_ids
         coverage_ratio = (
-            len(set(goals) & covered_competencies) / len(goals)
-            if goals
+            len(goals_key & covered_competencies) / len(mentee.goals)
+            if mentee.goals
             else 1.0
         )
         mentee_coverage[mentee.name] = coverage_ratio
@@ -259,43 +408,36 @@ def build_learning_journey(
             goal for goal in mentee.goals if goal.lower() not in covered_competencies
         )
 
-        desired_sessions = min(weeks * program.sessions_per_week, remaining_capacity)
-        assigned = 0
-        for week in range(1, weeks + 1):
-            for _ in range(program.sessions_per_week):
-                if assigned >= desired_sessions:
-                    break
-                course = recommended[assigned % len(recommended)]
-                focus = "лаборатория" if course.lab_required else "семинар"
-                sessions.append(
-                    Session(
-                        week=week,
-                        mentor=mentor.name,
-                        mentee=mentee.name,
-                        course_id=course.course_id,
-                        focus=focus,
-                    )
-                )
-                mentor_load[mentor.name] += 1
-                assigned += 1
-            if assigned >= desired_sessions:
-                break
+        desired_sessions = max(0, min(weeks * program.sessions_per_week, remaining_capacity))
+        slots = islice(
+            product(range(1, weeks + 1), range(program.sessions_per_week)),
+            desired_sessions,
+        )
+        # Курсы чередуются по кругу: cycle() вместо деления по модулю на каждое
+        # занятие. Session создаётся позиционно — в горячем цикле это заметно
+        # дешевле разбора именованных аргументов (неделя, ментор, участник,
+        # курс, формат).
+        sessions.extend(
+            [
+                Session(week, mentor.name, mentee.name, course_id, focus)
+                for (week, _), (course_id, focus) in zip(slots, cycle(zip(course_ids, foci)))
+            ]
+        )
+        assigned = desired_sessions
+        load += assigned
 
         progress_gap = max(0.0, target_score - mentee.baseline_score)
-        extra_target = max(0, int(round(progress_gap * len(recommended))) - 1)
-        extra_capacity = available_capacity - mentor_load[mentor.name]
-        for extra_index in range(min(extra_target, extra_capacity)):
-            course = recommended[(assigned + extra_index) % len(recommended)]
-            sessions.append(
-                Session(
-                    week=weeks + extra_index + 1,
-                    mentor=mentor.name,
-                    mentee=mentee.name,
-                    course_id=course.course_id,
-                    focus="практикум",
-                )
+        extra_target = max(0, int(round(progress_gap * n_courses)) - 1)
+        extra_capacity = available_capacity - load
+        extra_sessions = [
+            Session(weeks + extra_index + 1, mentor.name, mentee.name, course_id, "практикум")
+            for extra_index, course_id in zip(
+                range(min(extra_target, extra_capacity)),
+                islice(cycle(course_ids), assigned % n_courses, None),
             )
-            mentor_load[mentor.name] += 1
+        ]
+        sessions += extra_sessions
+        mentor_load[mentor.name] = load + len(extra_sessions)
 
     return JourneyResult(
         sessions=tuple(sessions),